@@ -1,12 +1,21 @@
 import os
-from fastapi import FastAPI, Depends
-from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import Annotated, Optional, Dict, Any, List
+import inspect
+from contextlib import asynccontextmanager, contextmanager
+from fastapi import Body, FastAPI, Depends, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Annotated, Optional, Dict, Any, List, Callable, Mapping, Tuple, Type
+import orjson
 import uvicorn
 import logging
+import logging.handlers
+import queue
 
 from robot_commander import (
+    EMPTY_PARAMETERS,
     RobotCommander,
     robot_commander,
     robot_commander_factory,
@@ -24,6 +33,57 @@ logging.basicConfig(
 
 logging.getLogger("watchfiles.main").setLevel(logging.WARNING)
 
+# Interactive docs and the OpenAPI schema can be disabled with ENABLE_DOCS=0
+ENABLE_DOCS = os.getenv("ENABLE_DOCS", "1") == "1"
+
+
+@contextmanager
+def queued_logging():
+    """
+    Move the root log handlers onto a background thread while the server runs.
+    
+    Records are only enqueued on the event loop thread, console and file
+    output happen on the listener's thread. The original handlers are put
+    back on exit, and the listener writes out all queued records before it
+    stops.
+    """
+    root = logging.getLogger()
+    handlers = root.handlers[:]
+    log_queue = queue.SimpleQueue()
+    log_listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    root.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    log_listener.start()
+    try:
+        yield
+    finally:
+        root.handlers[:] = handlers
+        log_listener.stop()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Select the robot commander once at startup.
+    
+    Running this in the app lifespan (rather than the __main__ block) means
+    the robot is also configured when served directly by uvicorn, e.g. under
+    systemd or in reload mode, where the __main__ block never runs.
+    """
+    with queued_logging():
+        if os.getenv("ROBOT") == "booster-t1":
+            robot_commander_factory.using_booster_t1()
+        else:
+            robot_commander_factory.using_mock()
+        if ENABLE_DOCS:
+            # Build the OpenAPI schema now so the first /docs request doesn't stall
+            app.openapi()
+        # The commander context leaves the robot idle when the server shuts down
+        async with robot_commander_factory.get_robot_commander():
+            yield
+
+
 app = FastAPI(
     title="Booster T1 Robot Command API",
     description="""
@@ -47,8 +107,8 @@ The Booster T1 is a humanoid robot with the following capabilities:
 ## Command Queue
 
 The robot processes one command at a time. If the robot is busy executing a command, 
-new commands will be queued (max queue size: 1). If the queue is full, additional 
-commands will be skipped.
+new commands will be queued in order (max queue size: 8 on the Booster T1, 1 in mock 
+mode). If the queue is full, additional commands will be skipped.
 
 ## Usage Notes
 
@@ -57,6 +117,11 @@ commands will be skipped.
 - The robot automatically stops movement after command completion
     """,
     version="1.0.0",
+    default_response_class=ORJSONResponse,
+    docs_url="/docs" if ENABLE_DOCS else None,
+    redoc_url="/redoc" if ENABLE_DOCS else None,
+    openapi_url="/openapi.json" if ENABLE_DOCS else None,
+    lifespan=lifespan,
     contact={
         "name": "Booster Platform Support",
         "url": "https://github.com/thinkinrocks/booster-platform",
@@ -67,20 +132,117 @@ commands will be skipped.
     },
 )
 
-# Configure CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Allow all origins for development
-    allow_credentials=True,
-    allow_methods=["*"],  # Allow all methods
-    allow_headers=["*"],  # Allow all headers
-)
+# ============================================================================
+# CORS Middleware
+# ============================================================================
+
+class AllowAllCORSMiddleware:
+    """
+    Pure ASGI CORS middleware allowing all origins, methods and headers.
+
+    Behaves like Starlette's CORSMiddleware configured with wildcards and
+    credentials, but all constant headers are encoded once at startup and
+    simply appended to each response.
+    """
+
+    ALLOW_METHODS = b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+
+    def __init__(self, app: ASGIApp, max_age: int = 600):
+        self.app = app
+        self.simple_headers = [
+            (b"access-control-allow-origin", b"*"),
+            (b"access-control-allow-credentials", b"true"),
+        ]
+        self.preflight_headers = [
+            (b"content-type", b"text/plain; charset=utf-8"),
+            (b"content-length", b"2"),
+            (b"vary", b"Origin"),
+            (b"access-control-allow-methods", self.ALLOW_METHODS),
+            (b"access-control-max-age", str(max_age).encode("latin-1")),
+            (b"access-control-allow-credentials", b"true"),
+        ]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = requested_method = requested_headers = None
+        has_cookie = False
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                requested_method = value
+            elif name == b"access-control-request-headers":
+                requested_headers = value
+            elif name == b"cookie":
+                has_cookie = True
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS" and requested_method is not None:
+            headers = self.preflight_headers + [(b"access-control-allow-origin", origin)]
+            if requested_headers is not None:
+                headers.append((b"access-control-allow-headers", requested_headers))
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+            await send({"type": "http.response.body", "body": b"OK"})
+            return
+
+        if has_cookie:
+            # Credentialed requests must get their own origin back instead of "*"
+            cors_headers = [
+                (b"access-control-allow-origin", origin),
+                (b"access-control-allow-credentials", b"true"),
+                (b"vary", b"Origin"),
+            ]
+        else:
+            cors_headers = self.simple_headers
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *cors_headers]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+
+# Configure CORS (all origins, methods and headers allowed for development)
+app.add_middleware(AllowAllCORSMiddleware)
+
+
+@app.exception_handler(RequestValidationError)
+async def request_validation_exception_handler(request: Request, exc: RequestValidationError):
+    # Same body as FastAPI's default handler, but encoded with orjson so
+    # rejected non-finite inputs (e.g. a duration of Infinity) echoed back in
+    # the errors become null instead of failing the response with a 500
+    return ORJSONResponse(status_code=422, content={"detail": jsonable_encoder(exc.errors())})
 
 
 # ============================================================================
 # Pydantic Models
 # ============================================================================
 
+class CommandRequest(BaseModel):
+    """Request body for the generic command endpoint"""
+    
+    command: str = Field(..., description="Command name (see /commands)")
+    parameters: Optional[Dict[str, float]] = Field(None, description="Command parameters (if applicable)")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "command": "wave-hand",
+                "parameters": {"duration": 1.0},
+            }
+        },
+        extra="forbid",
+        frozen=True,
+    )
+
+
 class CommandResponse(BaseModel):
     """Standard response model for all command endpoints"""
     
@@ -88,14 +250,15 @@ class CommandResponse(BaseModel):
     message: str = Field(..., description="Human-readable status message")
     data: Optional[Dict[str, Any]] = Field(None, description="Additional response data (if applicable)")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "success": True,
                 "message": "Command executed successfully",
                 "data": None,
             }
-        }
+        },
+    )
 
 
 class WaveHandRequest(BaseModel):
@@ -109,12 +272,15 @@ class WaveHandRequest(BaseModel):
         examples=[1.0, 2.5, 5.0]
     )
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "duration": 1.0
             }
-        }
+        },
+        extra="forbid",
+        frozen=True,
+    )
 
 
 class RobotStatus(BaseModel):
@@ -123,13 +289,14 @@ class RobotStatus(BaseModel):
     robot_name: str = Field(..., description="Name/type of the robot commander")
     is_busy: bool = Field(..., description="Whether the robot is currently executing a command")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "robot_name": "booster_t1",
                 "is_busy": False
             }
-        }
+        },
+    )
 
 
 class CommandInfo(BaseModel):
@@ -145,8 +312,8 @@ class CommandsListResponse(BaseModel):
     
     commands: List[CommandInfo] = Field(..., description="Available robot commands")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "commands": [
                     {
@@ -161,7 +328,138 @@ class CommandsListResponse(BaseModel):
                     }
                 ]
             }
-        }
+        },
+    )
+
+
+# ============================================================================
+# Command Dispatch
+# ============================================================================
+
+# Command name -> (handler, response message, parameters model), resolved with
+# a single lookup. Parameters are validated against the same model as the
+# dedicated endpoint; commands without a model take no parameters.
+COMMAND_DISPATCH: Dict[
+    str,
+    Tuple[Callable[[RobotCommander, Mapping[str, Any]], Any], str, Optional[Type[BaseModel]]],
+] = {
+    "wave-hand": (lambda rc, p: rc.wave_hand(parameters=p), "Waving hand", WaveHandRequest),
+    "cancel-wave-hand": (lambda rc, p: rc.cancel_wave_hand(), "Cancelled wave hand", None),
+    "move-forward": (lambda rc, p: rc.move_forward(parameters=p), "Moving forward", None),
+    "move-backward": (lambda rc, p: rc.move_backward(parameters=p), "Moving backward", None),
+    "turn-left": (lambda rc, p: rc.turn_left(parameters=p), "Turning left", None),
+    "turn-right": (lambda rc, p: rc.turn_right(parameters=p), "Turning right", None),
+}
+
+
+async def dispatch_command(
+    robot_cmd: RobotCommander,
+    command: str,
+    parameters: Optional[Mapping[str, Any]] = None,
+    location: Tuple[str, ...] = ("body", "parameters"),
+) -> CommandResponse:
+    """
+    Look up a command in the dispatch table and forward it to the robot commander.
+    
+    Raises RequestValidationError (422) if the parameters are invalid for the
+    command, with error locations prefixed by `location`.
+    """
+    entry = COMMAND_DISPATCH.get(command)
+    if entry is None:
+        return CommandResponse(
+            success=False,
+            message=f"Unknown command: {command}",
+            data=None
+        )
+    handler, message, parameters_model = entry
+    if parameters_model is not None:
+        try:
+            validated = parameters_model.model_validate(parameters or {})
+        except ValidationError as exc:
+            raise RequestValidationError(
+                [{**error, "loc": (*location, *error["loc"])} for error in exc.errors()]
+            ) from exc
+        parameters = validated.model_dump()
+    else:
+        parameters = EMPTY_PARAMETERS
+    result = handler(robot_cmd, parameters)
+    if inspect.isawaitable(result):
+        await result
+    return CommandResponse(
+        success=True,
+        message=message,
+        data=None
+    )
+
+
+# ============================================================================
+# Pre-encoded Responses
+# ============================================================================
+
+# Constant response bodies are serialized once at import time
+_HEALTH_BODY = orjson.dumps({"status": "healthy"})
+
+_ROOT_BODY = orjson.dumps({
+    "message": "Welcome to Booster T1 Robot Command API",
+    "version": "1.0.0",
+    "documentation": "/docs" if ENABLE_DOCS else None,
+    "openapi_spec": "/openapi.json" if ENABLE_DOCS else None,
+    "endpoints": {
+        "/health": "Health check",
+        "/status": "Robot status",
+        "/commands": "List available commands",
+        "/command": "Execute a command by name",
+        "/command/{verb}": "Execute the named command",
+        "/wave-hand": "Wave hand gesture",
+        "/cancel-wave-hand": "Cancel wave hand",
+        "/move-forward": "Move forward",
+        "/move-backward": "Move backward",
+        "/turn-left": "Turn left",
+        "/turn-right": "Turn right",
+    },
+})
+
+_COMMANDS_LIST = CommandsListResponse(
+    commands=[
+        CommandInfo(
+            command="wave-hand",
+            description="Make the robot wave its hand (opens hand, waits for duration, then closes)",
+            parameters={"duration": "Duration in seconds to keep hand waving (0.1-10.0, default: 1.0)"}
+        ),
+        CommandInfo(
+            command="cancel-wave-hand",
+            description="Immediately close the hand and cancel any ongoing wave gesture",
+            parameters=None
+        ),
+        CommandInfo(
+            command="move-forward",
+            description="Move the robot forward for 1 second",
+            parameters=None
+        ),
+        CommandInfo(
+            command="move-backward",
+            description="Move the robot backward for 1 second",
+            parameters=None
+        ),
+        CommandInfo(
+            command="turn-left",
+            description="Rotate the robot left for 1 second",
+            parameters=None
+        ),
+        CommandInfo(
+            command="turn-right",
+            description="Rotate the robot right for 1 second",
+            parameters=None
+        ),
+    ]
+)
+_COMMANDS_BODY = orjson.dumps(_COMMANDS_LIST.model_dump())
+
+_CANCEL_WAVE_HAND_BODY = orjson.dumps(CommandResponse(success=True, message="Cancelled wave hand").model_dump())
+_MOVE_FORWARD_BODY = orjson.dumps(CommandResponse(success=True, message="Moving forward").model_dump())
+_MOVE_BACKWARD_BODY = orjson.dumps(CommandResponse(success=True, message="Moving backward").model_dump())
+_TURN_LEFT_BODY = orjson.dumps(CommandResponse(success=True, message="Turning left").model_dump())
+_TURN_RIGHT_BODY = orjson.dumps(CommandResponse(success=True, message="Turning right").model_dump())
 
 
 # ============================================================================
@@ -178,23 +476,7 @@ async def root():
     """
     Welcome endpoint providing API overview and available endpoints.
     """
-    return {
-        "message": "Welcome to Booster T1 Robot Command API",
-        "version": "1.0.0",
-        "documentation": "/docs",
-        "openapi_spec": "/openapi.json",
-        "endpoints": {
-            "/health": "Health check",
-            "/status": "Robot status",
-            "/commands": "List available commands",
-            "/wave-hand": "Wave hand gesture",
-            "/cancel-wave-hand": "Cancel wave hand",
-            "/move-forward": "Move forward",
-            "/move-backward": "Move backward",
-            "/turn-left": "Turn left",
-            "/turn-right": "Turn right",
-        },
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
 @app.get(
@@ -210,7 +492,7 @@ async def health_check():
     Returns:
         dict: Status indicating the server is healthy
     """
-    return {"status": "healthy"}
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 @app.get(
@@ -237,7 +519,7 @@ async def get_status(
 
 @app.get(
     "/commands",
-    response_model=CommandsListResponse,
+    responses={200: {"model": CommandsListResponse}},
     summary="List Available Commands",
     description="Get a list of all available robot commands with descriptions",
     tags=["General"]
@@ -249,49 +531,93 @@ async def list_commands():
     Returns:
         CommandsListResponse: List of commands with descriptions and parameters
     """
-    commands = [
-        CommandInfo(
-            command="wave-hand",
-            description="Make the robot wave its hand (opens hand, waits for duration, then closes)",
-            parameters={"duration": "Duration in seconds to keep hand waving (0.1-10.0, default: 1.0)"}
-        ),
-        CommandInfo(
-            command="cancel-wave-hand",
-            description="Immediately close the hand and cancel any ongoing wave gesture",
-            parameters=None
-        ),
-        CommandInfo(
-            command="move-forward",
-            description="Move the robot forward for 1 second",
-            parameters=None
-        ),
-        CommandInfo(
-            command="move-backward",
-            description="Move the robot backward for 1 second",
-            parameters=None
-        ),
-        CommandInfo(
-            command="turn-left",
-            description="Rotate the robot left for 1 second",
-            parameters=None
-        ),
-        CommandInfo(
-            command="turn-right",
-            description="Rotate the robot right for 1 second",
-            parameters=None
-        ),
-    ]
-    return CommandsListResponse(commands=commands)
+    return Response(content=_COMMANDS_BODY, media_type="application/json")
+
+
+@app.post(
+    "/command",
+    summary="Execute Command",
+    description="Execute any available command by name with optional parameters",
+    tags=["Commands"],
+    responses={
+        200: {
+            "model": CommandResponse,
+            "description": "Command successfully queued or executed, or unknown command",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "success": True,
+                        "message": "Waving hand",
+                        "data": None
+                    }
+                }
+            }
+        }
+    }
+)
+async def execute_command(
+    request: CommandRequest,
+    robot_cmd: Annotated[RobotCommander, Depends(robot_commander)],
+):
+    """
+    Execute a command by name.
+    
+    The command is looked up in the dispatch table and forwarded to the robot
+    commander with the given parameters. Unknown commands are reported with
+    `success: false`, invalid parameters (e.g. a `wave-hand` duration outside
+    0.1-10 seconds) are rejected with 422 like on the dedicated endpoints.
+    
+    If the robot is busy, the command will be queued.
+    """
+    return await dispatch_command(robot_cmd, request.command, request.parameters)
+
+
+@app.post(
+    "/command/{verb}",
+    summary="Execute Command by Path",
+    description="Execute any available command named in the path, with optional parameters as the body",
+    tags=["Commands"],
+    responses={
+        200: {
+            "model": CommandResponse,
+            "description": "Command successfully queued or executed, or unknown command",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "success": True,
+                        "message": "Turning left",
+                        "data": None
+                    }
+                }
+            }
+        }
+    }
+)
+async def execute_verb(
+    verb: str,
+    robot_cmd: Annotated[RobotCommander, Depends(robot_commander)],
+    parameters: Annotated[Optional[Dict[str, float]], Body()] = None,
+):
+    """
+    Execute the command named in the path, e.g. `POST /command/turn-left`.
+    
+    Uses the same dispatch table as `/command`. Parameters, if any, are sent
+    as the JSON body, e.g. `{"duration": 2.0}` for `wave-hand`, and are
+    validated like on the dedicated endpoint (422 if invalid).
+    
+    If the robot is busy, the command will be queued.
+    """
+    return await dispatch_command(robot_cmd, verb, parameters, location=("body",))
 
 
 @app.post(
     "/wave-hand",
-    response_model=CommandResponse,
     summary="Wave Hand",
     description="Command the robot to wave its hand for a specified duration",
     tags=["Hand Gestures"],
     responses={
         200: {
+            "model": CommandResponse,
             "description": "Command successfully queued or executed",
             "content": {
                 "application/json": {
@@ -317,7 +643,7 @@ async def wave_hand(
     2. Keep the hand open for the specified duration
     3. Close the hand
     
-    If the robot is busy, the command will be queued (queue size: 1).
+    If the robot is busy, the command will be queued.
     If the queue is full, the command will be skipped.
     
     **Technical Details:**
@@ -337,12 +663,12 @@ async def wave_hand(
 
 @app.post(
     "/cancel-wave-hand",
-    response_model=CommandResponse,
     summary="Cancel Wave Hand",
     description="Immediately cancel the wave hand gesture and close the hand",
     tags=["Hand Gestures"],
     responses={
         200: {
+            "model": CommandResponse,
             "description": "Hand gesture cancelled",
             "content": {
                 "application/json": {
@@ -368,21 +694,17 @@ async def cancel_wave_hand(
     - Executes synchronously (does not use the command queue)
     """
     robot_cmd.cancel_wave_hand()
-    return CommandResponse(
-        success=True,
-        message="Cancelled wave hand",
-        data=None
-    )
+    return Response(content=_CANCEL_WAVE_HAND_BODY, media_type="application/json")
 
 
 @app.post(
     "/move-forward",
-    response_model=CommandResponse,
     summary="Move Forward",
     description="Move the robot forward for 1 second",
     tags=["Movement"],
     responses={
         200: {
+            "model": CommandResponse,
             "description": "Movement command queued or executed",
             "content": {
                 "application/json": {
@@ -411,22 +733,18 @@ async def move_forward(
     
     If the robot is busy, the command will be queued.
     """
-    await robot_cmd.move_forward(parameters={})
-    return CommandResponse(
-        success=True,
-        message="Moving forward",
-        data=None
-    )
+    await robot_cmd.move_forward(parameters=EMPTY_PARAMETERS)
+    return Response(content=_MOVE_FORWARD_BODY, media_type="application/json")
 
 
 @app.post(
     "/move-backward",
-    response_model=CommandResponse,
     summary="Move Backward",
     description="Move the robot backward for 1 second",
     tags=["Movement"],
     responses={
         200: {
+            "model": CommandResponse,
             "description": "Movement command queued or executed",
             "content": {
                 "application/json": {
@@ -455,22 +773,18 @@ async def move_backward(
     
     If the robot is busy, the command will be queued.
     """
-    await robot_cmd.move_backward(parameters={})
-    return CommandResponse(
-        success=True,
-        message="Moving backward",
-        data=None
-    )
+    await robot_cmd.move_backward(parameters=EMPTY_PARAMETERS)
+    return Response(content=_MOVE_BACKWARD_BODY, media_type="application/json")
 
 
 @app.post(
     "/turn-left",
-    response_model=CommandResponse,
     summary="Turn Left",
     description="Rotate the robot left (counter-clockwise) for 1 second",
     tags=["Movement"],
     responses={
         200: {
+            "model": CommandResponse,
             "description": "Turn command queued or executed",
             "content": {
                 "application/json": {
@@ -498,22 +812,18 @@ async def turn_left(
     
     If the robot is busy, the command will be queued.
     """
-    await robot_cmd.turn_left(parameters={})
-    return CommandResponse(
-        success=True,
-        message="Turning left",
-        data=None
-    )
+    await robot_cmd.turn_left(parameters=EMPTY_PARAMETERS)
+    return Response(content=_TURN_LEFT_BODY, media_type="application/json")
 
 
 @app.post(
     "/turn-right",
-    response_model=CommandResponse,
     summary="Turn Right",
     description="Rotate the robot right (clockwise) for 1 second",
     tags=["Movement"],
     responses={
         200: {
+            "model": CommandResponse,
             "description": "Turn command queued or executed",
             "content": {
                 "application/json": {
@@ -541,17 +851,16 @@ async def turn_right(
     
     If the robot is busy, the command will be queued.
     """
-    await robot_cmd.turn_right(parameters={})
-    return CommandResponse(
-        success=True,
-        message="Turning right",
-        data=None
-    )
+    await robot_cmd.turn_right(parameters=EMPTY_PARAMETERS)
+    return Response(content=_TURN_RIGHT_BODY, media_type="application/json")
 
 
 if __name__ == "__main__":
-    if os.getenv("ROBOT") == "booster-t1":
-        robot_commander_factory.using_booster_t1()
-    else:
-        robot_commander_factory.using_mock()
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        reload=os.getenv("UVICORN_RELOAD") == "1",  # Auto-reload for development only
+        loop="uvloop",  # Provided by uvicorn[standard]
+        http="httptools",  # Provided by uvicorn[standard]
+    )
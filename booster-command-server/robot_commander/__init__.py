@@ -1,8 +1,15 @@
 import logging
 import asyncio
+import functools
+import threading
 from abc import ABC, abstractmethod
+from types import MappingProxyType
+from typing import Any, Mapping
 import os
 
+# Shared read-only default for command parameters
+EMPTY_PARAMETERS: Mapping[str, Any] = MappingProxyType({})
+
 
 class RobotCommander(ABC):
     @abstractmethod
@@ -14,7 +21,7 @@ class RobotCommander(ABC):
         pass
 
     @abstractmethod
-    async def wave_hand(self, parameters: dict = {}):
+    async def wave_hand(self, parameters: Mapping[str, Any] = EMPTY_PARAMETERS):
         pass
 
     @abstractmethod
@@ -22,19 +29,27 @@ class RobotCommander(ABC):
         pass
 
     @abstractmethod
-    async def move_forward(self, parameters: dict = {}):
+    async def move_forward(self, parameters: Mapping[str, Any] = EMPTY_PARAMETERS):
         pass
 
     @abstractmethod
-    async def move_backward(self, parameters: dict = {}):
+    async def move_backward(self, parameters: Mapping[str, Any] = EMPTY_PARAMETERS):
         pass
 
     @abstractmethod
-    async def turn_left(self, parameters: dict = {}):
+    async def turn_left(self, parameters: Mapping[str, Any] = EMPTY_PARAMETERS):
         pass
 
     @abstractmethod
-    async def turn_right(self, parameters: dict = {}):
+    async def turn_right(self, parameters: Mapping[str, Any] = EMPTY_PARAMETERS):
+        pass
+
+    async def __aenter__(self) -> "RobotCommander":
+        """Start any background work, called once when the server starts."""
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        """Stop background work and leave the robot idle on server shutdown."""
         pass
 
 
@@ -43,130 +58,80 @@ class MockRobotCommander(RobotCommander):
         self.logger = logging.getLogger("mock-robot-commander")
         self.logger.setLevel(logging.DEBUG if verbose else logging.INFO)
         self.logger.info("Initializing mock robot commander")
+        # Cached so disabled debug logging costs a single attribute check
+        self._debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
 
-        self.command_queue = asyncio.Queue(maxsize=1)
-        self.busy_lock = asyncio.Lock()
+        self._pending = None  # Single queued command, if any
+        self._busy = False
 
     def busy(self) -> bool:
-        return self.busy_lock.locked()
+        return self._busy
 
     def name(self) -> str:
         return "mock"
 
     async def _process_next_command(self):
         """Process the next command from the queue if available."""
-        if not self.command_queue.empty():
-            self.logger.debug("Executing next command from queue")
-            try:
-                command, params = self.command_queue.get_nowait()
-                await command(params)
-            except asyncio.QueueEmpty:
-                self.logger.debug("Command queue is empty, skipping command")
-
-    async def _execute_wave_hand(self, parameters: dict = {}):
-        """Internal method that executes wave_hand with the busy_lock."""
-        async with self.busy_lock:
-            self.logger.debug("Waving hand")
-            await asyncio.sleep(parameters.get("duration", 1))
-            self.cancel_wave_hand()
-            self.logger.debug("Waved hand")
+        command, self._pending = self._pending, None
+        if command is not None:
+            if self._debug_enabled:
+                self.logger.debug("Executing next command from queue")
+            await command()
+
+    async def _run(self, name: str, duration: float, finalize=None):
+        """Internal method that executes a command while flagged busy."""
+        self._busy = True
+        try:
+            if self._debug_enabled:
+                self.logger.debug(name)
+            await asyncio.sleep(duration)
+            if finalize is not None:
+                finalize()
+        finally:
+            self._busy = False
         await self._process_next_command()
 
-    async def wave_hand(self, parameters: dict = {}):
-        """Non-blocking wave_hand command - runs in background."""
+    def _submit(self, name: str, duration: float, finalize=None):
+        """Start a command in the background, or queue it if the robot is busy."""
+        command = functools.partial(self._run, name, duration, finalize)
         if self.busy():
-            self.logger.debug("Robot is busy, adding command to queue")
-            try:
-                self.command_queue.put_nowait((self._execute_wave_hand, parameters))
-            except asyncio.QueueFull:
-                self.logger.debug("Command queue is full, skipping command")
+            if self._pending is not None:
+                if self._debug_enabled:
+                    self.logger.debug("Command queue is full, skipping command")
+            else:
+                if self._debug_enabled:
+                    self.logger.debug("Robot is busy, adding command to queue")
+                self._pending = command
             return
 
-        # Start the command execution in the background
-        asyncio.create_task(self._execute_wave_hand(parameters))
+        # Start the command execution in the background, flagging busy right
+        # away so commands arriving before the task starts get queued
+        self._busy = True
+        asyncio.create_task(command())
 
-    def cancel_wave_hand(self):
-        self.logger.debug("Cancelling waved hand")
+    async def wave_hand(self, parameters: Mapping[str, Any] = EMPTY_PARAMETERS):
+        """Non-blocking wave_hand command - runs in background."""
+        self._submit("Waving hand", parameters.get("duration", 1), self.cancel_wave_hand)
 
-    async def _execute_move_forward(self, parameters: dict = {}):
-        """Internal method that executes move_forward with the busy_lock."""
-        async with self.busy_lock:
-            self.logger.debug("Moving forward")
-            await asyncio.sleep(1)
-        await self._process_next_command()
+    def cancel_wave_hand(self):
+        if self._debug_enabled:
+            self.logger.debug("Cancelling waved hand")
 
-    async def move_forward(self, parameters: dict = {}):
+    async def move_forward(self, parameters: Mapping[str, Any] = EMPTY_PARAMETERS):
         """Non-blocking move_forward command - runs in background."""
-        if self.busy():
-            self.logger.debug("Robot is busy, adding command to queue")
-            try:
-                self.command_queue.put_nowait((self._execute_move_forward, parameters))
-            except asyncio.QueueFull:
-                self.logger.debug("Command queue is full, skipping command")
-            return
-
-        # Start the command execution in the background
-        asyncio.create_task(self._execute_move_forward(parameters))
-
-    async def _execute_move_backward(self, parameters: dict = {}):
-        """Internal method that executes move_backward with the busy_lock."""
-        async with self.busy_lock:
-            self.logger.debug("Moving backward")
-            await asyncio.sleep(1)
-        await self._process_next_command()
+        self._submit("Moving forward", 1)
 
-    async def move_backward(self, parameters: dict = {}):
+    async def move_backward(self, parameters: Mapping[str, Any] = EMPTY_PARAMETERS):
         """Non-blocking move_backward command - runs in background."""
-        if self.busy():
-            self.logger.debug("Robot is busy, adding command to queue")
-            try:
-                self.command_queue.put_nowait((self._execute_move_backward, parameters))
-            except asyncio.QueueFull:
-                self.logger.debug("Command queue is full, skipping command")
-            return
-
-        # Start the command execution in the background
-        asyncio.create_task(self._execute_move_backward(parameters))
+        self._submit("Moving backward", 1)
 
-    async def _execute_turn_left(self, parameters: dict = {}):
-        """Internal method that executes turn_left with the busy_lock."""
-        async with self.busy_lock:
-            self.logger.debug("Turning left")
-            await asyncio.sleep(1)
-        await self._process_next_command()
-
-    async def turn_left(self):
+    async def turn_left(self, parameters: Mapping[str, Any] = EMPTY_PARAMETERS):
         """Non-blocking turn_left command - runs in background."""
-        if self.busy():
-            self.logger.debug("Robot is busy, adding command to queue")
-            try:
-                self.command_queue.put_nowait((self._execute_turn_left, 1))
-            except asyncio.QueueFull:
-                self.logger.debug("Command queue is full, skipping command")
-            return
-
-        # Start the command execution in the background
-        asyncio.create_task(self._execute_turn_left(1))
-
-    async def _execute_turn_right(self, parameters: dict = {}):
-        """Internal method that executes turn_right with the busy_lock."""
-        async with self.busy_lock:
-            self.logger.debug("Turning right")
-            await asyncio.sleep(1)
-        await self._process_next_command()
+        self._submit("Turning left", 1)
 
-    async def turn_right(self, parameters: dict = {}):
+    async def turn_right(self, parameters: Mapping[str, Any] = EMPTY_PARAMETERS):
         """Non-blocking turn_right command - runs in background."""
-        if self.busy():
-            self.logger.debug("Robot is busy, adding command to queue")
-            try:
-                self.command_queue.put_nowait((self._execute_turn_right, parameters))
-            except asyncio.QueueFull:
-                self.logger.debug("Command queue is full, skipping command")
-            return
-
-        # Start the command execution in the background
-        asyncio.create_task(self._execute_turn_right(parameters))
+        self._submit("Turning right", 1)
 
 
 class RobotCommanderFactory:
@@ -174,36 +139,47 @@ class RobotCommanderFactory:
         self.logger = logging.getLogger("robot-commander-factory")
         self.verbose = verbose
         self.robot_commander = None
+        # Guards commander creation, re-entrant as get_robot_commander calls using_*
+        self._lock = threading.RLock()
 
     def using_booster_t1(self) -> "RobotCommanderFactory":
         from robot_commander.booster_t1_robot import BoosterT1Commander
 
         self.logger.info("Using booster_t1 robot commander")
-        if self.robot_commander is None or not isinstance(
-            self.robot_commander, BoosterT1Commander
-        ):
-            self.robot_commander = BoosterT1Commander(verbose=self.verbose)
+        with self._lock:
+            if self.robot_commander is None or not isinstance(
+                self.robot_commander, BoosterT1Commander
+            ):
+                self.robot_commander = BoosterT1Commander(verbose=self.verbose)
         return self
 
     def using_mock(self) -> "RobotCommanderFactory":
         self.logger.info("Using mock robot commander")
-        if self.robot_commander is None or not isinstance(
-            self.robot_commander, MockRobotCommander
-        ):
-            self.robot_commander = MockRobotCommander(verbose=self.verbose)
+        with self._lock:
+            if self.robot_commander is None or not isinstance(
+                self.robot_commander, MockRobotCommander
+            ):
+                self.robot_commander = MockRobotCommander(verbose=self.verbose)
         return self
 
     def get_robot_commander(self) -> RobotCommander:
-        if self.robot_commander is not None:
-            return self.robot_commander
-        elif os.getenv("ROBOT") == "booster-t1":
-            return self.using_booster_t1().robot_commander
-        else:
-            return self.using_mock().robot_commander
+        # Fast path: the commander is normally selected once at startup
+        commander = self.robot_commander
+        if commander is not None:
+            return commander
+        with self._lock:
+            if self.robot_commander is not None:
+                return self.robot_commander
+            elif os.getenv("ROBOT") == "booster-t1":
+                return self.using_booster_t1().robot_commander
+            else:
+                return self.using_mock().robot_commander
 
 
 robot_commander_factory = RobotCommanderFactory(verbose=True)
 
 
-def robot_commander() -> RobotCommander:
+async def robot_commander() -> RobotCommander:
+    # Declared async so FastAPI resolves the dependency inline on the event
+    # loop instead of dispatching a sync function to its threadpool
     return robot_commander_factory.get_robot_commander()
@@ -1,174 +1,266 @@
 import asyncio
+import functools
 import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, ClassVar, Mapping, NamedTuple, Optional
 from booster_robotics_sdk_python import (
     B1HandAction,
     B1LocoClient,
     ChannelFactory,
 )
 
-from robot_commander import RobotCommander
+from robot_commander import EMPTY_PARAMETERS, RobotCommander
+
+
+class _Action(NamedTuple):
+    """Description of a timed robot action."""
+
+    progress: str  # Logged when the action starts
+    done: str  # Logged when the action has finished
+    failure: str  # Used in the error message if the SDK call fails
+    sdk_method: str  # B1LocoClient method starting the action
+    sdk_args: tuple  # Arguments for sdk_method
+    finalize: str  # Commander method ending the action
+    timed: bool = False  # Whether the "duration" parameter applies (default: 1 second)
+    coalesce: bool = False  # Whether consecutive queued runs merge into one longer run
+
+    def duration(self, parameters: Mapping[str, Any]) -> float:
+        return parameters.get("duration", 1) if self.timed else 1
 
 
 class BoosterT1Commander(RobotCommander):
-    def __init__(self, network_interface: str = "127.0.0.1", verbose: bool = False):
+    # The SDK channel factory is a process-wide singleton, initialized once
+    _channel_interface: ClassVar[Optional[str]] = None
+
+    _ACTIONS = {
+        "wave_hand": _Action(
+            "Waving hand", "Waved hand", "wave hand",
+            "WaveHand", (B1HandAction.kHandOpen,), "_close_hand", timed=True,
+        ),
+        "move_forward": _Action(
+            "Moving forward", "Moved forward", "move forward",
+            "Move", (0.5, 0.0, 0.0), "_cancel_move", coalesce=True,
+        ),
+        "move_backward": _Action(
+            "Moving backward", "Moved backward", "move backward",
+            "Move", (-0.2, 0.0, 0.0), "_cancel_move", coalesce=True,
+        ),
+        "turn_left": _Action(
+            "Turning left", "Turned left", "turn left",
+            "Move", (0.0, 0.0, 0.2), "_cancel_move", coalesce=True,
+        ),
+        "turn_right": _Action(
+            "Turning right", "Turned right", "turn right",
+            "Move", (0.0, 0.0, -0.2), "_cancel_move", coalesce=True,
+        ),
+    }
+
+    def __init__(
+        self,
+        network_interface: str = "127.0.0.1",
+        verbose: bool = False,
+        max_pending: int = 8,
+    ):
         self.logger = logging.getLogger("booster-t1-commander")
         self.logger.setLevel(logging.DEBUG if verbose else logging.INFO)
-        self.logger.info(f"Initializing robot client with host: {network_interface}")
-        ChannelFactory.Instance().Init(0, network_interface)
+        self.logger.info("Initializing robot client with host: %s", network_interface)
+        # Checked before the per-command debug calls, which are skipped unless verbose
+        self._debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+        if BoosterT1Commander._channel_interface is None:
+            ChannelFactory.Instance().Init(0, network_interface)
+            BoosterT1Commander._channel_interface = network_interface
+        elif BoosterT1Commander._channel_interface != network_interface:
+            self.logger.warning(
+                "Channel factory already initialized with host: %s, ignoring %s",
+                BoosterT1Commander._channel_interface,
+                network_interface,
+            )
         self.robot_client = B1LocoClient()
         self.robot_client.Init()
-        self.busy_lock = asyncio.Lock()
-        self.command_queue = asyncio.Queue(maxsize=1)
+        # SDK calls may block, so they run off the event loop. A single thread
+        # keeps them serialized in submission order.
+        self._sdk_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="booster-sdk")
+        # SDK calls with their constant arguments bound once, for the command hot path
+        self._stop = functools.partial(self.robot_client.Move, 0.0, 0.0, 0.0)
+        self._hand_close = functools.partial(self.robot_client.WaveHand, B1HandAction.kHandClose)
+        # Action key -> (action, bound SDK call, bound finalize method)
+        self._actions = {
+            key: (
+                action,
+                functools.partial(getattr(self.robot_client, action.sdk_method), *action.sdk_args),
+                getattr(self, action.finalize),
+            )
+            for key, action in self._ACTIONS.items()
+        }
+        # Key of the running action, only ever written by the worker task
+        self._running = None
+        # Actions waiting to run, in FIFO order
+        self._commands = deque()
+        self._max_pending = max_pending
+        # Set when actions are added, wakes up the worker
+        self._wakeup = asyncio.Event()
+        # Set to end the running action before its duration has elapsed
+        self._interrupt = asyncio.Event()
+        self._worker_task = None
 
     def busy(self) -> bool:
-        return self.busy_lock.locked()
+        return self._running is not None or bool(self._commands)
 
     def name(self) -> str:
         return "booster_t1"
 
-    async def _process_next_command(self):
-        """Process the next command from the queue if available."""
-        if not self.command_queue.empty():
-            self.logger.debug("Executing next command from queue")
-            try:
-                command, parameters = self.command_queue.get_nowait()
-                await command(parameters)
-            except asyncio.QueueEmpty:
-                self.logger.debug("Command queue is empty, skipping command")
-
-    async def _execute_wave_hand(self, parameters: dict = {}):
-        """Internal method that executes wave_hand with the busy_lock."""
-        async with self.busy_lock:
-            self.logger.debug("Waving hand")
-            result = self.robot_client.WaveHand(B1HandAction.kHandOpen)
-            if result != 0:
-                self.logger.error(f"Failed to wave hand: {result}")
-            await asyncio.sleep(parameters.get("duration", 1))
-            self.cancel_wave_hand()
-            self.logger.debug("Waved hand")
-        await self._process_next_command()
-
-    async def wave_hand(self, parameters: dict = {}):
-        """Non-blocking wave_hand command - runs in background."""
-        if self.busy():
-            self.logger.debug("Robot is busy, adding command to queue")
+    async def _worker(self):
+        """Long-lived task executing submitted actions one at a time."""
+        while True:
+            while not self._commands:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            key, parameters = self._commands.popleft()
+            action = self._ACTIONS[key]
+            duration = action.duration(parameters)
+            if action.coalesce:
+                # Merge directly following identical moves into one longer move,
+                # saving a stop and start SDK call per merged command
+                merged = 0
+                while self._commands and self._commands[0][0] == key:
+                    duration += action.duration(self._commands.popleft()[1])
+                    merged += 1
+                if merged and self._debug_enabled:
+                    self.logger.debug("Coalesced %d queued %s commands", merged, key)
+            self._running = key
             try:
-                self.command_queue.put_nowait((self._execute_wave_hand, parameters))
-            except asyncio.QueueFull:
-                self.logger.debug("Command queue is full, skipping command")
+                await self._execute(key, duration)
+            except Exception:
+                self.logger.exception("Failed to execute %s", key)
+            finally:
+                self._running = None
+            if self._commands:
+                if self._debug_enabled:
+                    self.logger.debug("Executing next command from queue")
+
+    async def _execute(self, key: str, duration: float):
+        """Internal method that executes a single action for duration seconds."""
+        action, start, finalize = self._actions[key]
+        self._interrupt.clear()
+        if self._debug_enabled:
+            self.logger.debug(action.progress)
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(self._sdk_executor, start)
+        if result != 0:
+            self.logger.error("Failed to %s: %s", action.failure, result)
+        try:
+            await asyncio.wait_for(self._interrupt.wait(), timeout=duration)
+            if self._debug_enabled:
+                self.logger.debug("Action interrupted")
+        except asyncio.TimeoutError:
+            pass
+        await loop.run_in_executor(self._sdk_executor, finalize)
+        if self._debug_enabled:
+            self.logger.debug(action.done)
+
+    def _submit(self, key: str, parameters: Mapping[str, Any] = EMPTY_PARAMETERS):
+        """Hand an action to the worker, or queue it if the robot is busy."""
+        # Actions not yet picked up by the worker count as pending too
+        pending = len(self._commands) + (self._running is not None)
+        if pending > self._max_pending:
+            self.logger.warning("Command queue is full, skipping command: %s", key)
             return
+        if pending:
+            if self._debug_enabled:
+                self.logger.debug("Robot is busy, adding command to queue")
+        self._commands.append((key, parameters))
+        self._wakeup.set()
+        if len(self._commands) > 1:
+            # More than one command waiting, most likely a client sending too fast
+            self.logger.warning("Command queue depth: %d", len(self._commands))
+
+        self._start_worker()
+
+    def _start_worker(self):
+        """Start the worker task unless it is already running."""
+        if self._sdk_executor is None:
+            # Restarted after __aexit__, e.g. by a later server lifespan on a
+            # new event loop, so the SDK thread and events are created anew
+            self._sdk_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="booster-sdk")
+            self._wakeup = asyncio.Event()
+            self._interrupt = asyncio.Event()
+        # Keep a reference to the worker so it isn't garbage collected
+        if self._worker_task is None or self._worker_task.done():
+            self._worker_task = asyncio.create_task(self._worker())
+
+    async def __aenter__(self) -> "BoosterT1Commander":
+        self._start_worker()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        """Stop the worker, dropping queued commands, and stop the robot."""
+        if self._worker_task is not None:
+            self._worker_task.cancel()
+            try:
+                await self._worker_task
+            except asyncio.CancelledError:
+                pass
+            self._worker_task = None
+        self._commands.clear()
+        # A cancelled action skips its finalize step, so always stop moving
+        # and close the hand to leave the robot in a neutral state
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._sdk_executor, self._cancel_move)
+        await loop.run_in_executor(self._sdk_executor, self._close_hand)
+        executor, self._sdk_executor = self._sdk_executor, None
+        executor.shutdown()
+
+    async def wave_hand(self, parameters: Mapping[str, Any] = EMPTY_PARAMETERS):
+        """Non-blocking wave_hand command - runs in background."""
+        self._submit("wave_hand", parameters)
 
-        # Start the command execution in the background
-        asyncio.create_task(self._execute_wave_hand(parameters))
+    def cancel(self):
+        """End the running action early, it still runs its finalize step."""
+        self._interrupt.set()
 
     def cancel_wave_hand(self):
-        self.logger.debug("Cancelling waved hand")
-        result = self.robot_client.WaveHand(B1HandAction.kHandClose)
+        """Close the hand, ending a running wave_hand action early."""
+        if self._running == "wave_hand":
+            # The running wave closes the hand itself once interrupted
+            self.cancel()
+        elif self._sdk_executor is None:
+            # Stopped, __aexit__ has already closed the hand
+            self.logger.warning("Commander is stopped, not cancelling waved hand")
+        else:
+            future = self._sdk_executor.submit(self._close_hand)
+            future.add_done_callback(self._log_close_hand_failure)
+
+    def _log_close_hand_failure(self, future):
+        if not future.cancelled() and future.exception() is not None:
+            self.logger.error("Failed to cancel waved hand", exc_info=future.exception())
+
+    def _close_hand(self):
+        if self._debug_enabled:
+            self.logger.debug("Cancelling waved hand")
+        result = self._hand_close()
         if result != 0:
-            self.logger.error(f"Failed to cancel waved hand: {result}")
+            self.logger.error("Failed to cancel waved hand: %s", result)
 
     def _cancel_move(self):
-        self.logger.debug("Cancelling move")
-        result = self.robot_client.Move(0.0, 0.0, 0.0)
+        if self._debug_enabled:
+            self.logger.debug("Cancelling move")
+        result = self._stop()
         if result != 0:
-            self.logger.error(f"Failed to cancel move: {result}")
-
-    async def _execute_move_forward(self, parameters: dict = {}):
-        """Internal method that executes move_forward with the busy_lock."""
-        async with self.busy_lock:
-            self.logger.debug("Moving forward")
-            result = self.robot_client.Move(0.5, 0.0, 0.0)
-            if result != 0:
-                self.logger.error(f"Failed to move forward: {result}")
-            await asyncio.sleep(1)
-            self._cancel_move()
-            self.logger.debug("Moved forward")
-        await self._process_next_command()
-
-    async def move_forward(self, parameters: dict = {}):
+            self.logger.error("Failed to cancel move: %s", result)
+
+    async def move_forward(self, parameters: Mapping[str, Any] = EMPTY_PARAMETERS):
         """Non-blocking move_forward command - runs in background."""
-        if self.busy():
-            self.logger.debug("Robot is busy, adding command to queue")
-            try:
-                self.command_queue.put_nowait((self._execute_move_forward, parameters))
-            except asyncio.QueueFull:
-                self.logger.debug("Command queue is full, skipping command")
-            return
+        self._submit("move_forward", parameters)
 
-        # Start the command execution in the background
-        asyncio.create_task(self._execute_move_forward(parameters))
-
-    async def _execute_move_backward(self, parameters: dict = {}):
-        """Internal method that executes move_backward with the busy_lock."""
-        async with self.busy_lock:
-            self.logger.debug("Moving backward")
-            result = self.robot_client.Move(-0.2, 0.0, 0.0)
-            if result != 0:
-                self.logger.error(f"Failed to move backward: {result}")
-            await asyncio.sleep(1)
-            self._cancel_move()
-            self.logger.debug("Moved backward")
-        await self._process_next_command()
-
-    async def move_backward(self, parameters: dict = {}):
+    async def move_backward(self, parameters: Mapping[str, Any] = EMPTY_PARAMETERS):
         """Non-blocking move_backward command - runs in background."""
-        if self.busy():
-            self.logger.debug("Robot is busy, adding command to queue")
-            try:
-                self.command_queue.put_nowait((self._execute_move_backward, parameters))
-            except asyncio.QueueFull:
-                self.logger.debug("Command queue is full, skipping command")
-            return
+        self._submit("move_backward", parameters)
 
-        # Start the command execution in the background
-        asyncio.create_task(self._execute_move_backward(parameters))
-
-    async def _execute_turn_left(self, parameters: dict = {}):
-        """Internal method that executes turn_left with the busy_lock."""
-        async with self.busy_lock:
-            self.logger.debug("Turning left")
-            result = self.robot_client.Move(0.0, 0.0, 0.2)
-            if result != 0:
-                self.logger.error(f"Failed to turn left: {result}")
-            await asyncio.sleep(1)
-            self._cancel_move()
-            self.logger.debug("Turned left")
-        await self._process_next_command()
-
-    async def turn_left(self, parameters: dict = {}):
+    async def turn_left(self, parameters: Mapping[str, Any] = EMPTY_PARAMETERS):
         """Non-blocking turn_left command - runs in background."""
-        if self.busy():
-            self.logger.debug("Robot is busy, adding command to queue")
-            try:
-                self.command_queue.put_nowait((self._execute_turn_left, parameters))
-            except asyncio.QueueFull:
-                self.logger.debug("Command queue is full, skipping command")
-            return
+        self._submit("turn_left", parameters)
 
-        # Start the command execution in the background
-        asyncio.create_task(self._execute_turn_left(parameters))
-
-    async def _execute_turn_right(self, parameters: dict = {}):
-        """Internal method that executes turn_right with the busy_lock."""
-        async with self.busy_lock:
-            self.logger.debug("Turning right")
-            result = self.robot_client.Move(0.0, 0.0, -0.2)
-            if result != 0:
-                self.logger.error(f"Failed to turn right: {result}")
-            await asyncio.sleep(1)
-            self._cancel_move()
-            self.logger.debug("Turned right")
-        await self._process_next_command()
-
-    async def turn_right(self, parameters: dict = {}):
+    async def turn_right(self, parameters: Mapping[str, Any] = EMPTY_PARAMETERS):
         """Non-blocking turn_right command - runs in background."""
-        if self.busy():
-            self.logger.debug("Robot is busy, adding command to queue")
-            try:
-                self.command_queue.put_nowait((self._execute_turn_right, parameters))
-            except asyncio.QueueFull:
-                self.logger.debug("Command queue is full, skipping command")
-            return
-
-        # Start the command execution in the background
-        asyncio.create_task(self._execute_turn_right(parameters))
+        self._submit("turn_right", parameters)